@@ -19,23 +19,62 @@ responses.  Guardrails include:
 from __future__ import annotations
 
 import asyncio
+import re
 import time
-from typing import List, Dict, Tuple, Optional
+from operator import attrgetter
+from typing import List, Set, Tuple, Optional
 
-from .pii import PiiDetector, PiiSpan
+import cachetools
+
+from .pii import PiiDetector, PiiSpan, get_pii_detector
 from .schemas import Citation
 
+try:
+    import ahocorasick  # type: ignore
+except ImportError:
+    ahocorasick = None  # type: ignore
+
 
 # Example list of topics considered out of scope.  In a real system this
 # could be replaced by a classifier or curated list of allowed topics.
+# The corpus and the API are French-facing, so French keywords are
+# listed alongside the English ones; both the compiled alternation and
+# the automaton below are built from this single list.
 DISALLOWED_TOPICS = [
     "politics",
     "violence",
     "weapon",
     "hate speech",
     "adult",
+    "politique",
+    "arme",
+    "haine",
 ]
 
+# Single case-insensitive alternation over all disallowed topics so the
+# question is scanned once instead of once per keyword.
+_DISALLOWED_RE = re.compile("|".join(map(re.escape, DISALLOWED_TOPICS)), re.IGNORECASE)
+
+
+def _build_disallowed_automaton():
+    """Build an Aho–Corasick automaton over the disallowed topics.
+
+    The automaton matches in O(len(text) + matches) regardless of how
+    many keywords the blocklist contains, so classification stays cheap
+    as the list grows.  Returns None when pyahocorasick is unavailable;
+    the regex alternation is used instead.
+    """
+    if ahocorasick is None:
+        return None
+    automaton = ahocorasick.Automaton()
+    for topic in DISALLOWED_TOPICS:
+        automaton.add_word(topic, topic)
+    automaton.make_automaton()
+    return automaton
+
+
+_DISALLOWED_AUTOMATON = _build_disallowed_automaton()
+
 
 class RateLimiter:
     """Simple token bucket rate limiter per client.
@@ -44,26 +83,36 @@ class RateLimiter:
     identifier.  It is suitable for a single‑process deployment.  In
     distributed setups (multiple API workers) a shared store such as
     Redis should be used instead.
+
+    Per-client state lives in a bounded TTL cache so idle clients
+    expire instead of accumulating forever, and locking is striped
+    across a fixed number of locks so concurrent requests from
+    different clients do not serialise on a single global lock.
     """
 
+    _NUM_STRIPES = 64
+
     def __init__(self, requests: int, period: float) -> None:
         self.capacity = requests
         self.period = period
-        self.tokens: Dict[str, float] = {}
-        self.lock = asyncio.Lock()
+        # (tokens, last_refill_time) per client; bounded and expiring
+        self.tokens: cachetools.TTLCache = cachetools.TTLCache(maxsize=100_000, ttl=period * 10)
+        self._locks = [asyncio.Lock() for _ in range(self._NUM_STRIPES)]
+        # Constant refill rate, precomputed so allow() avoids a division
+        self._refill_per_sec = requests / period
 
     async def allow(self, client_id: str) -> bool:
         """Return True if a request from *client_id* is allowed."""
-        async with self.lock:
+        lock = self._locks[hash(client_id) & (self._NUM_STRIPES - 1)]
+        async with lock:
             now = time.monotonic()
-            tokens, last_time = self.tokens.get(client_id, (self.capacity, now))
+            tokens, last_time = self.tokens.get(client_id, (float(self.capacity), now))
             # Refill tokens
-            elapsed = now - last_time
-            refill = (elapsed / self.period) * self.capacity
-            tokens = min(self.capacity, tokens + refill)
+            tokens += (now - last_time) * self._refill_per_sec
+            if tokens > self.capacity:
+                tokens = self.capacity
             if tokens >= 1:
-                tokens -= 1
-                self.tokens[client_id] = (tokens, now)
+                self.tokens[client_id] = (tokens - 1, now)
                 return True
             else:
                 self.tokens[client_id] = (tokens, now)
@@ -77,14 +126,12 @@ def classify_question(question: str) -> bool:
     disallowed topic keyword.  This can be replaced by a more
     sophisticated semantic classifier or finite set of allowed domains.
     """
-    lower_q = question.lower()
-    for topic in DISALLOWED_TOPICS:
-        if topic in lower_q:
-            return False
-    return True
+    if _DISALLOWED_AUTOMATON is not None:
+        return next(_DISALLOWED_AUTOMATON.iter(question.lower()), None) is None
+    return _DISALLOWED_RE.search(question) is None
 
 
-def validate_citations(citations: List[Citation], retrieved_docs: Dict[Tuple[str, int], str]) -> bool:
+def validate_citations(citations: List[Citation], retrieved_docs: Set[Tuple[str, int]]) -> bool:
     """Check that every citation references a known retrieved passage.
 
     Parameters
@@ -92,22 +139,32 @@ def validate_citations(citations: List[Citation], retrieved_docs: Dict[Tuple[str
     citations:
         List of citations returned by the model.
     retrieved_docs:
-        Mapping from (doc_id, chunk_id) to the exact text of that chunk.
+        Set of (doc_id, chunk_id) keys of the retrieved chunks.  A
+        mapping keyed by those tuples works too, since only membership
+        is checked.
 
     Returns
     -------
     bool
         True if all citations refer to valid retrieved chunks, False otherwise.
     """
-    for citation in citations:
-        key = (citation.doc_id, citation.chunk_id)
-        if key not in retrieved_docs:
-            return False
-    return True
+    keys = retrieved_docs if isinstance(retrieved_docs, (set, frozenset)) else frozenset(retrieved_docs)
+    get_key = attrgetter("doc_id", "chunk_id")
+    return all(get_key(citation) in keys for citation in citations)
+
+
+# Every pattern of the regex fallback (email, phone, credit card) needs
+# an '@', a '+' or a digit; texts without any of these cannot match and
+# can skip that detector entirely.  Presidio also recognises entities
+# (names, locations, ...) that need none of those characters, so the
+# short-circuit must not apply when its engine is active.
+_MAYBE_PII = re.compile(r"[@+\d]")
 
 
 def mask_pii_in_text(text: str, pii_detector: Optional[PiiDetector] = None) -> str:
     """Mask any detected PII in the provided text using the configured detector."""
-    detector = pii_detector or PiiDetector()
+    detector = pii_detector or get_pii_detector()
+    if detector.presidio is None and not _MAYBE_PII.search(text):
+        return text
     spans = detector.detect(text)
     return detector.mask(text, spans)
@@ -10,20 +10,46 @@ latency histograms and request counters.
 from __future__ import annotations
 
 import asyncio
-from fastapi import FastAPI, HTTPException, Depends, Request
-from fastapi.responses import JSONResponse, PlainTextResponse
+from typing import Optional
+
+from fastapi import FastAPI, HTTPException, Depends, Request, Response
+from fastapi.responses import JSONResponse, ORJSONResponse
 from prometheus_client import Counter, Histogram, generate_latest, CONTENT_TYPE_LATEST
 
-from .settings import Settings
+from .settings import get_settings
 from .schemas import QueryRequest, QueryResponse, IngestRequest, HealthResponse
 from .rag_pipeline import answer_query
 from .guardrails import RateLimiter
+from .pii import get_pii_detector
+from .retriever import Retriever
+from .reranker import Reranker
 
 
-settings = Settings()
-app = FastAPI(title=settings.app_name)
+settings = get_settings()
+# orjson serialises the query responses (citations, floats) in C
+app = FastAPI(title=settings.app_name, default_response_class=ORJSONResponse)
 rate_limiter = RateLimiter(settings.rate_limit_requests, settings.rate_limit_period)
 
+# Shared pipeline components, built once at startup and reused across
+# requests so the SQLAlchemy engine pool and the cross-encoder weights
+# are not re-created per query.
+retriever: Optional[Retriever] = None
+reranker: Optional[Reranker] = None
+
+
+@app.on_event("startup")
+async def init_pipeline_components() -> None:
+    """Build the shared pipeline components before serving traffic.
+
+    Warms the PII detector (spaCy/Presidio model load) and constructs
+    the retriever and reranker singletons so the first real request
+    does not pay their initialisation cost.
+    """
+    global retriever, reranker
+    get_pii_detector()
+    retriever = Retriever(settings)
+    reranker = Reranker(settings)
+
 # Prometheus metrics
 REQUEST_COUNT = Counter(
     "rag_api_requests_total", "Total number of requests", ["endpoint"]
@@ -48,7 +74,7 @@ async def query_endpoint(request: Request, payload: QueryRequest) -> QueryRespon
         raise HTTPException(status_code=429, detail="Trop de requêtes, veuillez réessayer plus tard.")
     REQUEST_COUNT.labels(endpoint="query").inc()
     with REQUEST_LATENCY.labels(endpoint="query").time():
-        response = await answer_query(payload.query, settings)
+        response = await answer_query(payload.query, settings, retriever=retriever, reranker=reranker)
     return response
 
 
@@ -68,7 +94,10 @@ async def ingest_endpoint(payload: IngestRequest) -> JSONResponse:
 
 
 @app.get("/metrics")
-async def metrics() -> PlainTextResponse:
-    """Expose Prometheus metrics for scraping."""
-    data = generate_latest()
-    return PlainTextResponse(content=data.decode("utf-8"), media_type=CONTENT_TYPE_LATEST)
+async def metrics() -> Response:
+    """Expose Prometheus metrics for scraping.
+
+    `generate_latest` already returns bytes; returning them directly
+    avoids a decode/re-encode round-trip on every scrape.
+    """
+    return Response(content=generate_latest(), media_type=CONTENT_TYPE_LATEST)
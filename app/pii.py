@@ -27,6 +27,32 @@ except ImportError:
     RecognizerResult = None  # type: ignore
     _HAS_PRESIDIO = False
 
+try:
+    import re2 as _re2  # type: ignore
+except ImportError:
+    _re2 = None  # type: ignore
+
+try:
+    import hyperscan  # type: ignore
+except ImportError:
+    hyperscan = None  # type: ignore
+
+
+def compile_pattern(pattern: str, flags: int = 0):
+    """Compile *pattern* with google-re2 when available, else stdlib `re`.
+
+    RE2 compiles to a DFA with guaranteed linear-time matching, which
+    protects the hot paths (PII fallback scanning, citation parsing)
+    against pathological backtracking on long model outputs.  Patterns
+    that RE2 cannot handle fall back transparently to the stdlib engine.
+    """
+    if _re2 is not None:
+        try:
+            return _re2.compile(pattern, flags)
+        except Exception:
+            pass
+    return re.compile(pattern, flags)
+
 
 @dataclass
 class PiiSpan:
@@ -38,13 +64,69 @@ class PiiSpan:
     score: float
 
 
+# Basic patterns to fall back on if Presidio is unavailable.  The raw
+# strings are combined below into a single alternation so the fallback
+# detector scans the text once instead of once per entity type.
+_EMAIL_RAW = r"[\w.-]+@[\w.-]+\.[A-Za-z]{2,}"
+_PHONE_RAW = r"\b(?:\+?\d{1,3}[\s.-]?)?(?:\(?\d{2,3}\)?[\s.-]?)?\d{3}[\s.-]?\d{4}\b"
+_CREDIT_CARD_RAW = r"\b(?:\d[ -]*?){13,19}\b"
+
+# One compiled pattern with a named group per entity type; the matched
+# group name (`match.lastgroup`) identifies the entity.  Branches are
+# ordered most-specific first: the phone pattern would otherwise claim
+# the leading digits of a credit card number and the card would be
+# mislabelled as two phone numbers.
+_COMBINED_PATTERN = compile_pattern(
+    f"(?P<EMAIL_ADDRESS>{_EMAIL_RAW})"
+    f"|(?P<CREDIT_CARD>{_CREDIT_CARD_RAW})"
+    f"|(?P<PHONE_NUMBER>{_PHONE_RAW})"
+)
+
+# Confidence score attributed to each regex-based entity type
+_FALLBACK_SCORES = {
+    "EMAIL_ADDRESS": 0.8,
+    "PHONE_NUMBER": 0.7,
+    "CREDIT_CARD": 0.9,
+}
+
+# Hyperscan pattern id -> entity type, mirroring the named groups above
+# (same most-specific-first order as the combined alternation)
+_HS_ENTITY_TYPES = ["EMAIL_ADDRESS", "CREDIT_CARD", "PHONE_NUMBER"]
+
+
+def _build_hyperscan_db():
+    """Compile the fallback patterns into a single Hyperscan database.
+
+    Hyperscan matches all patterns in one SIMD-accelerated pass, which
+    matters on the answer-masking path where inputs are long model
+    outputs.  Returns None when the library is missing or a pattern is
+    outside the supported PCRE subset; callers then use the combined
+    regex instead.
+    """
+    if hyperscan is None:
+        return None
+    try:
+        db = hyperscan.Database()
+        db.compile(
+            expressions=[raw.encode() for raw in (_EMAIL_RAW, _CREDIT_CARD_RAW, _PHONE_RAW)],
+            ids=list(range(len(_HS_ENTITY_TYPES))),
+            flags=[hyperscan.HS_FLAG_SOM_LEFTMOST] * len(_HS_ENTITY_TYPES),
+        )
+        return db
+    except Exception:
+        return None
+
+
+_HYPERSCAN_DB = _build_hyperscan_db()
+
+
 class PiiDetector:
     """Detect PII using either Presidio or simple regexes."""
 
-    # Basic patterns to fall back on if Presidio is unavailable
-    EMAIL_PATTERN = re.compile(r"[\w.-]+@[\w.-]+\.[A-Za-z]{2,}")
-    PHONE_PATTERN = re.compile(r"\b(?:\+?\d{1,3}[\s.-]?)?(?:\(?\d{2,3}\)?[\s.-]?)?\d{3}[\s.-]?\d{4}\b")
-    CREDIT_CARD_PATTERN = re.compile(r"\b(?:\d[ -]*?){13,19}\b")
+    # Individual patterns kept for reference and targeted use
+    EMAIL_PATTERN = re.compile(_EMAIL_RAW)
+    PHONE_PATTERN = re.compile(_PHONE_RAW)
+    CREDIT_CARD_PATTERN = re.compile(_CREDIT_CARD_RAW)
 
     def __init__(self) -> None:
         self.presidio: Optional[AnalyzerEngine] = None
@@ -63,21 +145,75 @@ class PiiDetector:
             results: List[RecognizerResult] = self.presidio.analyze(text=text, language="en")  # type: ignore[call-arg]
             for res in results:
                 spans.append(PiiSpan(start=res.start, end=res.end, entity_type=res.entity_type, score=res.score))
+        elif _HYPERSCAN_DB is not None and text.isascii():
+            # Hyperscan reports byte offsets, so only take this path
+            # when byte and character offsets coincide.  Overlapping
+            # matches are fine: mask() merges intervals.
+            def _on_match(pattern_id: int, start: int, end: int, flags: int, context: object) -> None:
+                entity_type = _HS_ENTITY_TYPES[pattern_id]
+                spans.append(PiiSpan(start, end, entity_type, _FALLBACK_SCORES[entity_type]))
+
+            _HYPERSCAN_DB.scan(text.encode("ascii"), match_event_handler=_on_match)
         else:
-            # Simple regex fallback
-            for match in self.EMAIL_PATTERN.finditer(text):
-                spans.append(PiiSpan(match.start(), match.end(), "EMAIL_ADDRESS", 0.8))
-            for match in self.PHONE_PATTERN.finditer(text):
-                spans.append(PiiSpan(match.start(), match.end(), "PHONE_NUMBER", 0.7))
-            for match in self.CREDIT_CARD_PATTERN.finditer(text):
-                spans.append(PiiSpan(match.start(), match.end(), "CREDIT_CARD", 0.9))
+            # Simple regex fallback: one pass over the text with the
+            # combined alternation; `lastgroup` names the entity type.
+            for match in _COMBINED_PATTERN.finditer(text):
+                entity_type = match.lastgroup or "UNKNOWN"
+                spans.append(
+                    PiiSpan(
+                        match.start(),
+                        match.end(),
+                        entity_type,
+                        _FALLBACK_SCORES.get(entity_type, 0.5),
+                    )
+                )
         return spans
 
     def mask(self, text: str, spans: List[PiiSpan]) -> str:
-        """Return the text with detected PII masked by asterisks."""
-        masked = list(text)
-        for span in spans:
-            for i in range(span.start, span.end):
-                if 0 <= i < len(masked):
-                    masked[i] = "*"
-        return "".join(masked)
+        """Return the text with detected PII masked by asterisks.
+
+        Spans are sorted and overlapping intervals merged, then the
+        output is assembled from alternating original slices and
+        ``"*"`` runs.  This avoids materialising the text as a list of
+        one-character strings and keeps the copies in C code.
+        """
+        if not spans or not text:
+            return text
+        n = len(text)
+        # Sort by start and merge overlapping/adjacent intervals
+        intervals: List[Tuple[int, int]] = []
+        for span in sorted(spans, key=lambda s: s.start):
+            start = max(span.start, 0)
+            end = min(span.end, n)
+            if start >= end:
+                continue
+            if intervals and start <= intervals[-1][1]:
+                intervals[-1] = (intervals[-1][0], max(intervals[-1][1], end))
+            else:
+                intervals.append((start, end))
+        parts: List[str] = []
+        pos = 0
+        for start, end in intervals:
+            parts.append(text[pos:start])
+            parts.append("*" * (end - start))
+            pos = end
+        parts.append(text[pos:])
+        return "".join(parts)
+
+
+_DETECTOR: Optional[PiiDetector] = None
+
+
+def get_pii_detector() -> PiiDetector:
+    """Return a process-wide :class:`PiiDetector` singleton.
+
+    Instantiating the detector is expensive when Presidio is available
+    (its ``AnalyzerEngine`` loads spaCy models and recognisers), so the
+    detector is created lazily on first use and then reused for all
+    subsequent queries.  Call this at application startup to warm the
+    engine before serving traffic.
+    """
+    global _DETECTOR
+    if _DETECTOR is None:
+        _DETECTOR = PiiDetector()
+    return _DETECTOR
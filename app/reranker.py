@@ -11,13 +11,31 @@ unavailable.
 
 from __future__ import annotations
 
+import os
 from typing import List
 
+import numpy as np  # type: ignore
+
 try:
     from sentence_transformers.cross_encoder import CrossEncoder  # type: ignore
 except ImportError:
     CrossEncoder = None  # type: ignore
 
+try:
+    import torch  # type: ignore
+except ImportError:
+    torch = None  # type: ignore
+
+try:
+    import onnxruntime  # type: ignore
+except ImportError:
+    onnxruntime = None  # type: ignore
+
+try:
+    from transformers import AutoTokenizer  # type: ignore
+except ImportError:
+    AutoTokenizer = None  # type: ignore
+
 from .retriever import DocumentChunk
 from .settings import Settings
 
@@ -29,16 +47,57 @@ class Reranker:
         self.settings = settings
         self.model_name = settings.reranker_model
         self.model: CrossEncoder | None = None
-        if CrossEncoder is not None:
+        # Quantized ONNX path: an INT8 export of the cross-encoder runs
+        # 2-4x faster on CPU than the PyTorch FP32 forward pass.  The
+        # export is produced offline and pointed at via
+        # settings.reranker_model_onnx; the PyTorch model stays as
+        # fallback.
+        self._onnx_session = None
+        self._onnx_tokenizer = None
+        if settings.reranker_model_onnx and onnxruntime is not None and AutoTokenizer is not None:
+            try:
+                opts = onnxruntime.SessionOptions()
+                opts.intra_op_num_threads = os.cpu_count() or 1
+                self._onnx_session = onnxruntime.InferenceSession(
+                    settings.reranker_model_onnx,
+                    sess_options=opts,
+                    providers=["CPUExecutionProvider"],
+                )
+                self._onnx_tokenizer = AutoTokenizer.from_pretrained(self.model_name)
+            except Exception:
+                self._onnx_session = None
+                self._onnx_tokenizer = None
+        if self._onnx_session is None and CrossEncoder is not None:
             try:
                 # Load the cross encoder with default settings.  By default
                 # this will download weights on first use; consider caching
                 # them in a volume for Docker builds.
-                self.model = CrossEncoder(self.model_name)
+                device = "cuda" if torch is not None and torch.cuda.is_available() else "cpu"
+                self.model = CrossEncoder(self.model_name, device=device)
+                if device == "cuda":
+                    # FP16 halves memory bandwidth of the forward pass;
+                    # reranker scores are robust to the precision loss.
+                    self.model.model.half()
             except Exception:
                 # If loading fails, we keep None and fall back to identity ranking
                 self.model = None
 
+    def _predict_onnx(self, pairs: List[tuple[str, str]]) -> np.ndarray:
+        """Score query/document pairs with the quantized ONNX session."""
+        encoded = self._onnx_tokenizer(  # type: ignore[misc]
+            [q for q, _ in pairs],
+            [d for _, d in pairs],
+            padding=True,
+            truncation=True,
+            max_length=512,
+            return_tensors="np",
+        )
+        input_names = {i.name for i in self._onnx_session.get_inputs()}  # type: ignore[union-attr]
+        inputs = {name: array for name, array in encoded.items() if name in input_names}
+        logits = self._onnx_session.run(None, inputs)[0]  # type: ignore[union-attr]
+        scores = logits[:, 0] if logits.ndim == 2 else logits.reshape(-1)
+        return np.asarray(scores, dtype=np.float32)
+
     def rerank(self, query: str, chunks: List[DocumentChunk], top_k: int | None = None) -> List[DocumentChunk]:
         """Rerank candidate chunks according to the query.
 
@@ -54,14 +113,27 @@ class Reranker:
         """
         if not chunks:
             return []
-        if self.model is None:
-            # Identity ranking if the cross‑encoder is not available
+        if self._onnx_session is None and self.model is None:
+            # Identity ranking if no scoring backend is available
             return chunks[: (top_k or len(chunks))]
-        # Prepare query-document pairs
+        # Prepare query-document pairs and score them in one batch
         pairs = [(query, c.content) for c in chunks]
-        scores = self.model.predict(pairs)  # type: ignore[attr-defined]
+        if self._onnx_session is not None:
+            scores = self._predict_onnx(pairs)
+        else:
+            scores = np.asarray(
+                self.model.predict(pairs, batch_size=32, convert_to_numpy=True),  # type: ignore[attr-defined]
+                dtype=np.float32,
+            )
         # Combine scores with the DocumentChunk objects
         for chunk, score in zip(chunks, scores):
             chunk.score = float(score)
-        sorted_chunks = sorted(chunks, key=lambda c: c.score, reverse=True)
-        return sorted_chunks[: (top_k or len(sorted_chunks))]
+        # Top-k selection in C: argpartition picks the k best, argsort
+        # orders only those k instead of sorting the whole list in Python.
+        k = min(top_k or len(chunks), len(chunks))
+        if k < len(chunks):
+            order = np.argpartition(-scores, k)[:k]
+            order = order[np.argsort(-scores[order])]
+        else:
+            order = np.argsort(-scores)
+        return [chunks[i] for i in order]
@@ -11,16 +11,20 @@ using either OpenAI or a local sentence‑transformers model.
 from __future__ import annotations
 
 import asyncio
-from dataclasses import dataclass
-from typing import List, Dict, Tuple, Optional
+import concurrent.futures
+from dataclasses import dataclass, field
+from typing import List, Optional
 
 import asyncpg
+import cachetools
 import numpy as np  # type: ignore
 
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncEngine
 
-from .settings import Settings
+from functools import lru_cache
+
+from .settings import Settings, get_settings
 
 try:
     import openai  # type: ignore
@@ -33,14 +37,62 @@ except ImportError:
     SentenceTransformer = None  # type: ignore
 
 
-@dataclass
+@dataclass(slots=True)
 class DocumentChunk:
-    """A chunk of a document retrieved from the database."""
+    """A chunk of a document retrieved from the database.
+
+    Instances are created in bulk for every query (retrieval results,
+    reranked lists), so slots keep them small and make the repeated
+    ``.score`` reads/writes cheaper than through a ``__dict__``.
+    """
 
     doc_id: str
     chunk_id: int
     content: str
     score: float
+    # Derived once at construction so prompt building and citation
+    # validation do not redo the f-string/strip per generation call.
+    tag: str = field(init=False, default="")
+    content_stripped: str = field(init=False, default="")
+
+    def __post_init__(self) -> None:
+        self.tag = f"[{self.doc_id}:{self.chunk_id}]"
+        self.content_stripped = self.content.strip()
+
+
+# Combined hybrid query: both ranked result sets are computed in one
+# statement so a query costs a single round-trip, and Postgres can share
+# the chunks/documents join between the two arms.
+_HYBRID_SQL = text(
+    """
+    WITH bm25 AS (
+        SELECT d.doc_id, c.chunk_id, c.content,
+               ts_rank(c.tsv, plainto_tsquery('english', :query)) AS score
+        FROM chunks c
+        JOIN documents d ON c.document_id = d.id
+        WHERE c.tsv @@ plainto_tsquery('english', :query)
+        ORDER BY score DESC
+        LIMIT :top_k
+    ),
+    vec AS (
+        SELECT d.doc_id, c.chunk_id, c.content,
+               (1 - (c.embedding <=> :embedding)) AS score
+        FROM chunks c
+        JOIN documents d ON c.document_id = d.id
+        ORDER BY c.embedding <=> :embedding
+        LIMIT :top_k
+    )
+    SELECT COALESCE(bm25.doc_id, vec.doc_id) AS doc_id,
+           COALESCE(bm25.chunk_id, vec.chunk_id) AS chunk_id,
+           COALESCE(bm25.content, vec.content) AS content,
+           COALESCE(bm25.score, 0) * :w_bm25 + COALESCE(vec.score, 0) * :w_vec AS score
+    FROM bm25
+    FULL OUTER JOIN vec
+        ON bm25.doc_id = vec.doc_id AND bm25.chunk_id = vec.chunk_id
+    ORDER BY score DESC
+    LIMIT :top_k
+    """
+)
 
 
 class Retriever:
@@ -50,30 +102,91 @@ class Retriever:
         self.settings = settings
         self._engine: AsyncEngine = create_async_engine(settings.database_url, echo=False)
         self._model: Optional[SentenceTransformer] = None
+        self._emb_executor: Optional[concurrent.futures.ThreadPoolExecutor] = None
+        # Query embeddings keyed by the normalised query text; repeated
+        # or retried queries skip the model/API round-trip entirely.
+        self._emb_cache: cachetools.LRUCache = cachetools.LRUCache(maxsize=4096)
+        # One async OpenAI client per retriever: avoids mutating the
+        # process-wide openai module state per call and reuses the
+        # client's internal connection pool.
+        self._openai = None
+        if settings.openai_api_key and openai is not None:
+            self._openai = openai.AsyncOpenAI(
+                api_key=settings.openai_api_key, base_url=settings.openai_api_base
+            )
         # Preload local embedding model if OpenAI key is not provided
         if not settings.openai_api_key and SentenceTransformer is not None:
-            # Use a light-weight all-MiniLM model for local embeddings
-            self._model = SentenceTransformer("sentence-transformers/all-MiniLM-L6-v2")
+            # Defaults to a light-weight all-MiniLM model for local embeddings
+            self._model = SentenceTransformer(settings.embedding_model)
+            # Run the forward pass on a dedicated thread so it does not
+            # block the event loop; a single worker keeps the model's
+            # compute serialised on one core instead of thrashing.
+            self._emb_executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="embed"
+            )
 
     async def _get_embedding(self, text: str) -> List[float]:
-        """Compute an embedding for a text string using the configured backend."""
-        if self.settings.openai_api_key and openai is not None:
+        """Compute an embedding for a text string using the configured backend.
+
+        Results are cached on the normalised query string, so identical
+        or retried queries cost a dictionary lookup instead of a model
+        forward pass or API call.
+        """
+        cache_key = text.strip().lower()
+        cached = self._emb_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        emb: Optional[List[float]] = None
+        if self._openai is not None:
             # Use OpenAI Embeddings API
             try:
-                openai.api_key = self.settings.openai_api_key
-                openai.base_url = self.settings.openai_api_base
-                resp = await openai.Embedding.acreate(
+                resp = await self._openai.embeddings.create(
                     input=[text],
                     model="text-embedding-ada-002",
-                )  # type: ignore[attr-defined]
-                return resp["data"][0]["embedding"]
+                )
+                emb = resp.data[0].embedding
+            except Exception:
+                # Fall back to local model if OpenAI fails
+                emb = None
+        if emb is None:
+            if self._model is None:
+                raise RuntimeError("No embedding model available; install sentence_transformers or set OPENAI_API_KEY")
+            # Offload the model forward pass so the event loop keeps serving
+            # other requests while the embedding is computed.
+            loop = asyncio.get_running_loop()
+            vector = await loop.run_in_executor(self._emb_executor, self._model.encode, text)
+            emb = vector.tolist()
+        self._emb_cache[cache_key] = emb
+        return emb
+
+    async def _get_embeddings_batch(self, texts: List[str]) -> List[List[float]]:
+        """Compute embeddings for a batch of texts in one backend call.
+
+        Batching amortises the HTTP round-trip on the OpenAI path and
+        lets sentence-transformers share tokenisation and matmul work
+        across the batch; ingestion should prefer this over calling
+        :meth:`_get_embedding` per chunk.
+        """
+        if not texts:
+            return []
+        if self._openai is not None:
+            try:
+                resp = await self._openai.embeddings.create(
+                    input=texts,
+                    model="text-embedding-ada-002",
+                )
+                return [item.embedding for item in resp.data]
             except Exception:
                 # Fall back to local model if OpenAI fails
                 pass
         if self._model is None:
             raise RuntimeError("No embedding model available; install sentence_transformers or set OPENAI_API_KEY")
-        emb: List[float] = self._model.encode(text).tolist()  # type: ignore[no-untyped-call]
-        return emb
+        loop = asyncio.get_running_loop()
+        vectors = await loop.run_in_executor(
+            self._emb_executor,
+            lambda: self._model.encode(texts, batch_size=64, convert_to_numpy=True),
+        )
+        return [vector.tolist() for vector in vectors]
 
     async def bm25_search(self, query: str, top_k: int) -> List[DocumentChunk]:
         """Perform a BM25 keyword search against the full‑text index."""
@@ -119,30 +232,37 @@ class Retriever:
         weight_bm25: Optional[float] = None,
         weight_vector: Optional[float] = None,
     ) -> List[DocumentChunk]:
-        """Combine BM25 and vector search with configurable weights."""
+        """Combine BM25 and vector search with configurable weights.
+
+        Both rankings and the weighted combination are computed in a
+        single SQL statement (see :data:`_HYBRID_SQL`), so a query costs
+        one database round-trip instead of two.
+        """
         k = top_k or self.settings.retrieval_top_k
         w_bm25 = weight_bm25 if weight_bm25 is not None else self.settings.hybrid_weight_bm25
         w_vec = weight_vector if weight_vector is not None else self.settings.hybrid_weight_vector
-        # Perform both searches concurrently
         emb = await self._get_embedding(query)
-        bm25_task = asyncio.create_task(self.bm25_search(query, k))
-        vector_task = asyncio.create_task(self.vector_search(emb, k))
-        bm25_results, vector_results = await asyncio.gather(bm25_task, vector_task)
-        # Merge by computing combined score
-        combined: Dict[Tuple[str, int], DocumentChunk] = {}
-        for chunk in bm25_results:
-            combined[(chunk.doc_id, chunk.chunk_id)] = DocumentChunk(
-                chunk.doc_id,
-                chunk.chunk_id,
-                chunk.content,
-                score=chunk.score * w_bm25,
+        async with self._engine.connect() as conn:
+            result = await conn.execute(
+                _HYBRID_SQL,
+                {
+                    "query": query,
+                    "embedding": emb,
+                    "top_k": k,
+                    "w_bm25": w_bm25,
+                    "w_vec": w_vec,
+                },
             )
-        for chunk in vector_results:
-            key = (chunk.doc_id, chunk.chunk_id)
-            if key in combined:
-                combined[key].score += chunk.score * w_vec
-            else:
-                combined[key] = DocumentChunk(chunk.doc_id, chunk.chunk_id, chunk.content, chunk.score * w_vec)
-        # Sort by combined score desc and return top_k
-        sorted_chunks = sorted(combined.values(), key=lambda c: c.score, reverse=True)
-        return sorted_chunks[:k]
+            rows = result.fetchall()
+        return [DocumentChunk(r.doc_id, r.chunk_id, r.content, float(r.score)) for r in rows]
+
+
+@lru_cache(maxsize=1)
+def get_retriever() -> Retriever:
+    """Return a process-wide :class:`Retriever` built from :func:`get_settings`.
+
+    Constructing a retriever loads the local embedding model and opens
+    database/HTTP clients, so scripts and tests should share a single
+    instance instead of paying that cost per call site.
+    """
+    return Retriever(get_settings())
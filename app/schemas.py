@@ -36,6 +36,13 @@ class QueryResponse(BaseModel):
     citations: List[Citation] = Field(..., description="Liste des citations avec identifiants et offsets")
     cost: Optional[float] = Field(None, description="Coût estimé de la requête en dollars")
     latency_ms: Optional[float] = Field(None, description="Durée totale de traitement de la requête en millisecondes")
+    # Excluded from API payloads; carried for offline evaluation so the
+    # pipeline's retrieval does not have to be re-run per question.
+    contexts: Optional[List[str]] = Field(
+        None,
+        description="Contenu des passages utilisés pour générer la réponse",
+        exclude=True,
+    )
 
 
 class IngestRequest(BaseModel):
@@ -17,6 +17,8 @@ guardrails such as rate limiting.
 
 from __future__ import annotations
 
+from functools import lru_cache
+
 from pydantic import BaseSettings, Field, validator
 from typing import Optional
 import os
@@ -61,9 +63,19 @@ class Settings(BaseSettings):
     hybrid_weight_vector: float = Field(0.5, env="HYBRID_WEIGHT_VECTOR")
     chunk_size: int = Field(512, env="CHUNK_SIZE")
     chunk_overlap: int = Field(64, env="CHUNK_OVERLAP")
+    embedding_model: str = Field(
+        "sentence-transformers/all-MiniLM-L6-v2",
+        env="EMBEDDING_MODEL",
+        description="Modèle d'embeddings local (sentence-transformers)",
+    )
 
     # Reranker configuration
     reranker_model: str = Field("BAAI/bge-reranker-large", env="RERANKER_MODEL")
+    reranker_model_onnx: Optional[str] = Field(
+        None,
+        env="RERANKER_MODEL_ONNX",
+        description="Chemin vers un export ONNX (idéalement quantifié INT8) du reranker",
+    )
 
     # Guardrails / rate limiting
     rate_limit_requests: int = Field(60, env="RATE_LIMIT_REQUESTS")
@@ -90,8 +102,27 @@ class Settings(BaseSettings):
 
     @validator("hybrid_weight_vector")
     def validate_weights(cls, v: float, values: dict[str, object]) -> float:
-        """Ensure the hybrid weights sum to ~1.0."""
-        w_bm25 = values.get("hybrid_weight_bm25") or 0.0
-        if abs(w_bm25 + v - 1.0) > 0.01:
-            raise ValueError("Hybrid weights for BM25 and vector search must sum to 1.0")
-        return v
+        """Normalise the hybrid weights so they always sum to 1.0.
+
+        Normalising once at configuration load means hybrid search can
+        apply the weights directly, with no re-checking or re-scaling
+        per query, and operators can express weights in any ratio
+        (e.g. 3 / 1) without computing the division themselves.
+        """
+        w_bm25 = float(values.get("hybrid_weight_bm25") or 0.0)
+        total = w_bm25 + v
+        if total <= 0:
+            raise ValueError("Hybrid weights for BM25 and vector search must have a positive sum")
+        values["hybrid_weight_bm25"] = w_bm25 / total
+        return v / total
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Return a cached :class:`Settings` instance.
+
+    Every ``Settings()`` call re-reads the ``.env`` file, scans the
+    environment and re-runs validation; scripts and tests should use
+    this accessor so configuration is parsed once per process.
+    """
+    return Settings()
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Shared loading of the evaluation question set.
+
+Both the RAGAS evaluation and the latency benchmark read
+`eval/questions.jsonl`.  This module parses it once and memoises the
+result in a sidecar pickle keyed on the JSONL file's modification
+time, so repeated invocations (CI, benchmark sweeps) skip the
+per-line JSON parsing entirely.  Parsing on a cache miss uses orjson
+when available.
+"""
+
+from __future__ import annotations
+
+import pickle
+from pathlib import Path
+from typing import Any, Dict, List
+
+try:
+    import orjson as _json  # type: ignore
+except ImportError:
+    import json as _json  # type: ignore
+
+
+def load_questions(path: Path) -> List[Dict[str, Any]]:
+    """Return the parsed entries of a JSONL question file.
+
+    The sidecar cache (`<name>.jsonl.pkl`) is refreshed whenever the
+    source file's mtime changes; a corrupt or unwritable cache is
+    ignored rather than failing the caller.
+    """
+    cache_path = path.with_suffix(path.suffix + ".pkl")
+    mtime = path.stat().st_mtime
+    if cache_path.exists():
+        try:
+            with cache_path.open("rb") as f:
+                cached_mtime, entries = pickle.load(f)
+            if cached_mtime == mtime:
+                return entries
+        except Exception:
+            pass
+    entries = []
+    with path.open("rb") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                entries.append(_json.loads(line))
+    try:
+        with cache_path.open("wb") as f:
+            pickle.dump((mtime, entries), f)
+    except OSError:
+        pass
+    return entries
@@ -17,60 +17,66 @@ degrade because generative evaluations rely on large language models.
 from __future__ import annotations
 
 import asyncio
-import json
 import os
 from pathlib import Path
 from typing import List, Dict
 
+try:
+    import uvloop  # type: ignore
+except ImportError:
+    uvloop = None  # type: ignore
+
+import pyarrow as pa  # type: ignore
 from datasets import Dataset  # type: ignore
 from ragas import evaluate  # type: ignore
 from ragas.metrics import faithfulness, answer_relevance, context_precision, context_recall  # type: ignore
 
-import sys
-from pathlib import Path
-
-# Ensure internal imports work when running as a script
-sys.path.append(str(Path(__file__).resolve().parents[1] / "rag-industrial-eval-guardrails"))
-
-from app.settings import Settings
+from app.settings import get_settings
 from app.rag_pipeline import answer_query
-from app.retriever import Retriever
+from app.retriever import get_retriever
 from app.reranker import Reranker
 
+try:
+    from scripts.eval_data import load_questions
+except ImportError:  # executed directly as `python scripts/evaluate_ragas.py`
+    from eval_data import load_questions
+
 
 async def run_evaluation() -> Dict[str, float]:
-    settings = Settings()
+    settings = get_settings()
     eval_file = Path(__file__).resolve().parents[1] / "eval" / "questions.jsonl"
     if not eval_file.exists():
         raise FileNotFoundError(f"Evaluation file {eval_file} not found")
-    # Read evaluation dataset
-    questions: List[str] = []
-    ground_truths: List[List[str]] = []
-    with eval_file.open("r", encoding="utf-8") as f:
-        for line in f:
-            obj = json.loads(line)
-            questions.append(obj["question"])
-            ground_truths.append(obj["ground_truths"])
-    answers: List[str] = []
-    contexts_list: List[List[str]] = []
-    retriever = Retriever(settings)
-    reranker = Reranker(settings)  # type: ignore[name-defined]
-    # Run pipeline for each question
-    for q in questions:
-        response = await answer_query(q, settings)
-        answers.append(response.answer)
-        # Retrieve contexts used by the pipeline for evaluation
-        retrieved = await retriever.hybrid_search(q)
-        reranked = reranker.rerank(q, retrieved)
-        top_contexts = reranked[:4]
-        contexts_list.append([c.content for c in top_contexts])
-    # Build HuggingFace dataset
-    ds = Dataset.from_dict({
-        "question": questions,
-        "answer": answers,
-        "contexts": contexts_list,
-        "ground_truths": ground_truths,
-    })
+    # Read evaluation dataset (parsed once, cached on disk)
+    entries = load_questions(eval_file)
+    questions: List[str] = [obj["question"] for obj in entries]
+    ground_truths: List[List[str]] = [obj["ground_truths"] for obj in entries]
+    retriever = get_retriever()
+    reranker = Reranker(settings)
+    # answer_query now reports the contexts it generated from, so the
+    # retrieval+reranking no longer has to be repeated per question here.
+    # Questions run concurrently, bounded by the configured rate limit.
+    semaphore = asyncio.Semaphore(settings.rate_limit_requests)
+
+    async def answer_one(q: str):
+        async with semaphore:
+            return await answer_query(q, settings, retriever=retriever, reranker=reranker)
+
+    responses = await asyncio.gather(*(answer_one(q) for q in questions))
+    answers: List[str] = [r.answer for r in responses]
+    contexts_list: List[List[str]] = [r.contexts or [] for r in responses]
+    # Build the HuggingFace dataset straight from Arrow arrays; pyarrow
+    # ships with datasets, and constructing the columnar table directly
+    # skips the per-column Python-object conversion of Dataset.from_dict
+    table = pa.table(
+        {
+            "question": pa.array(questions, type=pa.large_string()),
+            "answer": pa.array(answers, type=pa.large_string()),
+            "contexts": pa.array(contexts_list, type=pa.list_(pa.large_string())),
+            "ground_truths": pa.array(ground_truths, type=pa.list_(pa.large_string())),
+        }
+    )
+    ds = Dataset(table)
     metrics = [faithfulness, answer_relevance, context_precision, context_recall]
     results = evaluate(ds, metrics)  # type: ignore[no-untyped-call]
     # Save report
@@ -93,6 +99,8 @@ async def run_evaluation() -> Dict[str, float]:
 
 
 def main() -> None:
+    if uvloop is not None:
+        uvloop.install()
     results = asyncio.run(run_evaluation())
     for metric, score in results.items():
         print(f"{metric}: {score:.3f}")
@@ -15,11 +15,35 @@ database with sample data.  The Makefile exposes this via
 
 from __future__ import annotations
 
+import hashlib
 import os
 from pathlib import Path
 from fpdf import FPDF  # type: ignore
 
 
+def _content_digest(title: str, paragraphs: list[str]) -> str:
+    """Return a stable hash of a document's source content."""
+    return hashlib.sha256((title + "\n" + "\n".join(paragraphs)).encode("utf-8")).hexdigest()
+
+
+def _is_up_to_date(path: Path, digest: str) -> bool:
+    """Check whether *path* was already generated from the same content.
+
+    The digest of the last generation is persisted in a `.sha` sidecar
+    file; when it matches, the (comparatively expensive) PDF/HTML
+    rendering can be skipped entirely.  Tests regenerate the corpus on
+    every run, so this memoisation makes repeat runs near-instant.
+    """
+    sidecar = path.with_suffix(path.suffix + ".sha")
+    if not path.exists() or not sidecar.exists():
+        return False
+    return sidecar.read_text(encoding="utf-8").strip() == digest
+
+
+def _record_digest(path: Path, digest: str) -> None:
+    path.with_suffix(path.suffix + ".sha").write_text(digest, encoding="utf-8")
+
+
 def write_pdf(path: Path, title: str, paragraphs: list[str]) -> None:
     pdf = FPDF()
     pdf.set_auto_page_break(auto=True, margin=15)
@@ -90,10 +114,14 @@ def main() -> None:
     ]
     for filename, title, paragraphs in docs:
         out_path = corpus_dir / filename
+        digest = _content_digest(title, paragraphs)
+        if _is_up_to_date(out_path, digest):
+            continue
         if filename.endswith(".pdf"):
             write_pdf(out_path, title, paragraphs)
         else:
             write_html(out_path, title, paragraphs)
+        _record_digest(out_path, digest)
     print(f"Corpus synthétique généré dans {corpus_dir}")
 
 
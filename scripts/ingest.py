@@ -19,35 +19,90 @@ running (e.g. via `docker-compose up postgres`) before ingesting.
 from __future__ import annotations
 
 import asyncio
-import json
 import os
+import re
 from pathlib import Path
 from typing import List, Tuple
 
 import asyncpg
+import orjson
 from pdfminer.high_level import extract_text  # type: ignore
 from bs4 import BeautifulSoup  # type: ignore
 
-import sys
-from pathlib import Path
+try:
+    from selectolax.parser import HTMLParser  # type: ignore
+except ImportError:
+    HTMLParser = None  # type: ignore
+
+try:
+    import lxml  # type: ignore  # noqa: F401
+
+    _HAS_LXML = True
+except ImportError:
+    _HAS_LXML = False
+
+try:
+    from tokenizers import Tokenizer  # type: ignore
+except ImportError:
+    Tokenizer = None  # type: ignore
+
+try:
+    from pgvector.asyncpg import register_vector  # type: ignore
+except ImportError:
+    register_vector = None  # type: ignore
 
-# Ensure imports work when running this script directly
-sys.path.append(str(Path(__file__).resolve().parents[1] / "rag-industrial-eval-guardrails"))
+try:
+    import uvloop  # type: ignore
+except ImportError:
+    uvloop = None  # type: ignore
 
-from app.settings import Settings
-from app.retriever import Retriever
+from app.settings import Settings, get_settings
+from app.retriever import get_retriever
+
+
+_WORD_RE = re.compile(r"\S+")
 
 
 def chunk_tokens(text: str, chunk_size: int, overlap: int) -> List[str]:
-    """Split text into overlapping chunks of approximately `chunk_size` tokens."""
-    words = text.split()
-    chunks = []
+    """Split text into overlapping chunks of approximately `chunk_size` tokens.
+
+    Word boundaries are located once up front and each chunk is a direct
+    slice of the original text between two of them, so overlapping
+    chunks share the underlying data instead of re-joining word lists
+    for every window.
+    """
+    spans = [m.span() for m in _WORD_RE.finditer(text)]
+    chunks: List[str] = []
     start = 0
-    n = len(words)
+    n = len(spans)
     while start < n:
         end = min(start + chunk_size, n)
-        chunk_words = words[start:end]
-        chunks.append(" ".join(chunk_words))
+        chunks.append(text[spans[start][0] : spans[end - 1][1]])
+        if end == n:
+            break
+        start = end - overlap
+    return chunks
+
+
+def chunk_model_tokens(text: str, chunk_size: int, overlap: int, tokenizer: "Tokenizer") -> List[str]:
+    """Split text into overlapping chunks of `chunk_size` *model* tokens.
+
+    Whitespace "tokens" can map to several embedding-model tokens, so
+    whitespace-sized chunks regularly overshoot the model's window.
+    Tokenising once with the embedding model's own (Rust-backed)
+    tokenizer and sliding in token-id space yields chunks sized in the
+    units that actually matter downstream; the token offsets are mapped
+    back to the source text so the database stores human-readable spans.
+    """
+    encoding = tokenizer.encode(text)
+    # Special tokens carry a (0, 0) offset and would corrupt the slices
+    offsets = [span for span in encoding.offsets if span != (0, 0)]
+    chunks: List[str] = []
+    start = 0
+    n = len(offsets)
+    while start < n:
+        end = min(start + chunk_size, n)
+        chunks.append(text[offsets[start][0] : offsets[end - 1][1]])
         if end == n:
             break
         start = end - overlap
@@ -59,8 +114,14 @@ def extract_text_from_file(path: Path) -> str:
     if path.suffix.lower() == ".pdf":
         return extract_text(str(path))
     elif path.suffix.lower() in {".html", ".htm"}:
+        # selectolax wraps the lexbor C engine and is orders of
+        # magnitude faster than the pure-Python html.parser backend
+        if HTMLParser is not None:
+            tree = HTMLParser(path.read_bytes())
+            body = tree.body or tree.root
+            return body.text(separator=" ") if body is not None else ""
         with path.open("r", encoding="utf-8") as f:
-            soup = BeautifulSoup(f, "html.parser")
+            soup = BeautifulSoup(f, "lxml" if _HAS_LXML else "html.parser")
             return soup.get_text(separator=" ")
     else:
         raise ValueError(f"Unsupported file type: {path.suffix}")
@@ -79,45 +140,122 @@ async def ingest_corpus(settings: Settings) -> None:
         host=settings.postgres_host,
         port=settings.postgres_port,
     )
-    retriever = Retriever(settings)
-    for file_path in sorted(corpus_dir.iterdir()):
-        if not file_path.is_file():
-            continue
+    # With the pgvector codec registered, embeddings travel over the
+    # wire as raw float32 via the binary COPY protocol instead of as
+    # decimal text, and chunk loads go through a staging table with one
+    # COPY + one merge statement per document.
+    use_copy = False
+    if register_vector is not None:
+        try:
+            await register_vector(conn)
+            await conn.execute(
+                """
+                CREATE TEMP TABLE chunks_staging (
+                    document_id INTEGER,
+                    chunk_id INTEGER,
+                    content TEXT,
+                    embedding vector
+                )
+                """
+            )
+            use_copy = True
+        except Exception:
+            use_copy = False
+    retriever = get_retriever()
+    # Tokenizer of the embedding model, loaded once; when unavailable the
+    # whitespace-based chunker is used instead
+    tokenizer = None
+    if Tokenizer is not None:
+        try:
+            tokenizer = Tokenizer.from_pretrained(settings.embedding_model)
+        except Exception:
+            tokenizer = None
+    # Only pick up supported document types; the corpus directory also
+    # holds the .sha digest sidecars written by generate_synthetic_corpus
+    files = [
+        p
+        for p in sorted(corpus_dir.iterdir())
+        if p.is_file() and p.suffix.lower() in {".pdf", ".html", ".htm"}
+    ]
+
+    async def safe_extract(path: Path) -> str | None:
         try:
-            text = extract_text_from_file(file_path)
+            # pdfminer/bs4 are CPU-bound; run them on worker threads so
+            # extraction of all files overlaps
+            return await asyncio.to_thread(extract_text_from_file, path)
         except Exception as exc:
-            print(f"Erreur lors de l'extraction du fichier {file_path}: {exc}")
+            print(f"Erreur lors de l'extraction du fichier {path}: {exc}")
+            return None
+
+    texts = await asyncio.gather(*(safe_extract(path) for path in files))
+    # Chunk everything first, then embed the documents concurrently with
+    # a semaphore bounding pressure on the embedding backend
+    docs: List[Tuple[Path, str, List[str]]] = []
+    for file_path, text in zip(files, texts):
+        if text is None:
             continue
+        if tokenizer is not None:
+            chunks = chunk_model_tokens(text, settings.chunk_size, settings.chunk_overlap, tokenizer)
+        else:
+            chunks = chunk_tokens(text, settings.chunk_size, settings.chunk_overlap)
+        docs.append((file_path, text, chunks))
+
+    emb_semaphore = asyncio.Semaphore(8)
+
+    async def embed_document(chunks: List[str]) -> List[List[float]]:
+        async with emb_semaphore:
+            return await retriever._get_embeddings_batch(chunks)
+
+    all_embeddings = await asyncio.gather(*(embed_document(chunks) for _, _, chunks in docs))
+    # Statements are prepared once so Postgres parses and plans each of
+    # them a single time instead of once per document/chunk batch
+    insert_doc = await conn.prepare(
+        "INSERT INTO documents (doc_id, doc_name, content, metadata) VALUES ($1, $2, $3, $4) ON CONFLICT (doc_id) DO UPDATE SET content = EXCLUDED.content RETURNING id"
+    )
+    if use_copy:
+        merge_chunks = await conn.prepare(
+            "INSERT INTO chunks (document_id, chunk_id, content, embedding, tsv) SELECT document_id, chunk_id, content, embedding, to_tsvector('english', content) FROM chunks_staging ON CONFLICT (document_id, chunk_id) DO UPDATE SET content = EXCLUDED.content, embedding = EXCLUDED.embedding, tsv = EXCLUDED.tsv"
+        )
+    else:
+        insert_chunk = await conn.prepare(
+            "INSERT INTO chunks (document_id, chunk_id, content, embedding, tsv) VALUES ($1, $2, $3, $4, to_tsvector('english', $3)) ON CONFLICT (document_id, chunk_id) DO UPDATE SET content = EXCLUDED.content, embedding = EXCLUDED.embedding, tsv = EXCLUDED.tsv"
+        )
+    # Database writes stay sequential: a single asyncpg connection can
+    # only run one statement at a time
+    for (file_path, text, chunks), embeddings in zip(docs, all_embeddings):
         doc_id = file_path.name
         metadata = {"filename": file_path.name}
         # Insert or get document id
-        doc_row = await conn.fetchrow(
-            "INSERT INTO documents (doc_id, doc_name, content, metadata) VALUES ($1, $2, $3, $4) ON CONFLICT (doc_id) DO UPDATE SET content = EXCLUDED.content RETURNING id",
+        doc_row = await insert_doc.fetchrow(
             doc_id,
             file_path.stem,
             text,
-            json.dumps(metadata),
+            # asyncpg expects str for JSONB parameters
+            orjson.dumps(metadata).decode(),
         )
         document_id = doc_row["id"]
-        # Chunk text
-        chunks = chunk_tokens(text, settings.chunk_size, settings.chunk_overlap)
-        for idx, chunk_text in enumerate(chunks):
-            # Compute embedding
-            emb = await retriever._get_embedding(chunk_text)
-            # Insert chunk
-            await conn.execute(
-                "INSERT INTO chunks (document_id, chunk_id, content, embedding, tsv) VALUES ($1, $2, $3, $4, to_tsvector('english', $3)) ON CONFLICT (document_id, chunk_id) DO UPDATE SET content = EXCLUDED.content, embedding = EXCLUDED.embedding, tsv = EXCLUDED.tsv",
-                document_id,
-                idx,
-                chunk_text,
-                emb,
+        records = [
+            (document_id, idx, chunk_text, emb)
+            for idx, (chunk_text, emb) in enumerate(zip(chunks, embeddings))
+        ]
+        if use_copy:
+            await conn.execute("TRUNCATE chunks_staging")
+            await conn.copy_records_to_table(
+                "chunks_staging",
+                records=records,
+                columns=["document_id", "chunk_id", "content", "embedding"],
             )
+            await merge_chunks.fetch()
+        else:
+            await insert_chunk.executemany(records)
         print(f"Ingested {file_path.name} with {len(chunks)} chunks.")
     await conn.close()
 
 
 def main() -> None:
-    settings = Settings()
+    if uvloop is not None:
+        uvloop.install()
+    settings = get_settings()
     asyncio.run(ingest_corpus(settings))
 
 
@@ -1,13 +1,7 @@
 import asyncio
 import os
-import sys
 import pytest
 from httpx import AsyncClient  # type: ignore
-from pathlib import Path
-
-# Ensure the project package can be imported when the repository name contains hyphens.
-project_root = Path(__file__).resolve().parents[1]
-sys.path.append(str(project_root / "rag-industrial-eval-guardrails"))
 
 from app.main import app, settings
 from app.rag_pipeline import answer_query
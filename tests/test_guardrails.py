@@ -1,13 +1,8 @@
 import pytest
-import sys
-from pathlib import Path
 
-# Append project path for imports
-project_root = Path(__file__).resolve().parents[1]
-sys.path.append(str(project_root / "rag-industrial-eval-guardrails"))
-
-from app.pii import PiiDetector
-from app.guardrails import classify_question, validate_citations
+from app import pii
+from app.pii import PiiDetector, PiiSpan
+from app.guardrails import classify_question, mask_pii_in_text, validate_citations
 from app.schemas import Citation
 
 
@@ -23,6 +18,47 @@ def test_pii_detection_masking():
     assert "06" not in masked
 
 
+def test_credit_card_detected_as_credit_card(monkeypatch):
+    # Regression test: the combined alternation must try the credit card
+    # branch before the phone branch, otherwise a 16-digit card number is
+    # reported as two PHONE_NUMBER spans.
+    monkeypatch.setattr(pii, "_HYPERSCAN_DB", None)
+    detector = PiiDetector()
+    detector.presidio = None
+    spans = detector.detect("Ma carte est 4111 1111 1111 1111.")
+    assert any(span.entity_type == "CREDIT_CARD" for span in spans)
+    assert not any(span.entity_type == "PHONE_NUMBER" for span in spans)
+
+
+def test_mask_merges_overlapping_and_clamps_spans():
+    detector = PiiDetector()
+    text = "abcdefghij"
+    spans = [
+        PiiSpan(start=2, end=5, entity_type="X", score=1.0),
+        PiiSpan(start=4, end=7, entity_type="Y", score=1.0),
+        PiiSpan(start=-3, end=1, entity_type="Z", score=1.0),
+        PiiSpan(start=9, end=42, entity_type="W", score=1.0),
+    ]
+    # Overlaps are merged and out-of-range bounds clamped to the text
+    assert detector.mask(text, spans) == "*b*****hi*"
+    assert detector.mask(text, []) == text
+
+
+def test_mask_pii_in_text_presidio_digit_free():
+    # Regression test: the cheap '@'/'+'/digit pre-check must not skip
+    # detection when a Presidio engine is active, since NER entities
+    # (names, locations) need none of those characters.
+    class _StubPresidio:
+        def analyze(self, text, language):
+            return [PiiSpan(start=0, end=11, entity_type="PERSON", score=0.85)]
+
+    detector = PiiDetector()
+    detector.presidio = _StubPresidio()
+    masked = mask_pii_in_text("Jean Dupont travaille ici.", pii_detector=detector)
+    assert "Jean Dupont" not in masked
+    assert masked.endswith("travaille ici.")
+
+
 def test_classify_question_disallowed():
     assert classify_question("Quelle est votre opinion politique ?") is False
     assert classify_question("Quels sont les horaires de travail ?") is True
@@ -1,22 +1,16 @@
 import pytest
 import asyncpg
 import asyncio
-import sys
-from pathlib import Path
 
-# Append project path for imports
-project_root = Path(__file__).resolve().parents[1]
-sys.path.append(str(project_root / "rag-industrial-eval-guardrails"))
-
-from app.settings import Settings
-from app.retriever import Retriever
+from app.settings import get_settings
+from app.retriever import get_retriever
 from scripts.generate_synthetic_corpus import main as gen_corpus
 from scripts.ingest import ingest_corpus
 
 
 @pytest.mark.asyncio
 async def test_hybrid_retriever_returns_results():
-    settings = Settings()
+    settings = get_settings()
     try:
         conn = await asyncpg.connect(
             user=settings.postgres_user,
@@ -31,7 +25,7 @@ async def test_hybrid_retriever_returns_results():
     # Generate and ingest
     gen_corpus()
     await ingest_corpus(settings)
-    retriever = Retriever(settings)
+    retriever = get_retriever()
     results = await retriever.hybrid_search("mot de passe", top_k=3)
     assert len(results) > 0
     # Ensure scores are sorted descending